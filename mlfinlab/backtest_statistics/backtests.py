@@ -1,7 +1,11 @@
 # pylint: disable=missing-module-docstring
 import numpy as np
 import scipy.stats as ss
-from scipy import linalg
+from scipy.special import erfc, stdtr, stdtrit  # pylint: disable=no-name-in-module
+from numba import jit, prange
+
+# Number of observations per year by sampling frequency of returns
+TIMES_PER_YEAR = {'D': 360, 'W': 52, 'M': 12, 'Q': 4, 'A': 1}
 
 
 class CampbellBacktesting:
@@ -18,17 +22,26 @@ class CampbellBacktesting:
     significance, taking multiple testing into account.
     """
 
-    def __init__(self, simulations=2000):
+    def __init__(self, simulations=2000, seed=None):
         """
         Set the desired number of simulations to make in Haircut Sharpe Ratios or Profit Hurdle algorithms.
 
+        If the seed is set, the simulated t-statistics are generated once for every set of HLZ model parameters
+        and reused in subsequent calls with the same parameters.
+
         :param simulations: (int) Number of simulations
+        :param seed: (int) Seed for the random number generator used in simulations
         """
 
         self.simulations = simulations
+        self.seed = seed
+
+        # Simulated t-statistics by HLZ model parameters, used only if the seed is set
+        self._t_sample_cache = {}
 
     @staticmethod
-    def _sample_random_multest(rho, n_trails, prob_zero_mean, lambd, n_simulations, annual_vol=0.15, n_obs=240):
+    def _sample_random_multest(rho, n_trails, prob_zero_mean, lambd, n_simulations, annual_vol=0.15, n_obs=240,
+                               seed=None):
         """
         Generates empirical p-value distributions.
 
@@ -52,46 +65,65 @@ class CampbellBacktesting:
         :param annual_vol: (float) HLZ assume that the innovations in returns follow a normal distribution with a mean
                                    of zero and a standard deviation of ma = 15%
         :param n_obs: (int) Number of observations of used for volatility estimation from HLZ
-        :return: (np.ndarray) Array with distributions calculated
+        :param seed: (int) Seed for the random number generator, if None - fresh entropy from the OS is used
+        :return: (np.ndarray) Array with distributions calculated (in single precision)
         """
 
+        # Source of random numbers
+        rng = np.random.default_rng(seed)
+
         # Assumed level of monthly volatility = adjusted yearly volatility
         monthly_volatility = annual_vol / 12 ** (1 / 2)
 
-        # Creating a correlation matrix of simulated returns. All correlations are assumed to be the same as average
-        # correlation among returns
-        # The first row of the correlation matrix: [1, rho, rho, .., rho]
-        correlation_vector = np.insert(rho * np.ones((1, n_trails - 1)), 0, 1)
+        # All correlations among simulated returns are assumed to be the same as average correlation among returns,
+        # so the covariance matrix is (monthly_volatility ** 2 / n_obs) * ((1 - rho) * I + rho * 11').
+        # Such returns are a sum of an independent shock for every trial and one shock common to the whole simulation,
+        # so there is no need to create the covariance matrix and decompose it.
+        shock_std = monthly_volatility / n_obs ** (1 / 2)
 
-        # Correlation matrix created from the vector by expanding it
-        correlation_matrix = linalg.toeplitz(correlation_vector)
+        # Independent shocks and common shocks. Samples are generated in single precision, which is enough
+        # for the t-statistics and halves the memory used.
+        shock_mat = rng.standard_normal((n_simulations, n_trails), dtype=np.float32)
+        common_shock = rng.standard_normal((n_simulations, 1), dtype=np.float32)
 
-        # Vector with mean of simulated returns - zeros
-        mean = np.zeros(n_trails)
+        # Sample of uniform distribution with the same dimensions as shock_mat
+        prob_vec = rng.random((n_simulations, n_trails), dtype=np.float32)
 
-        # Creating a sample from a multivariate normal distribution as returns simulations
-        # Covariance matrix - Created from correlation matrix multiplied by monthly volatility and adjusted
-        covariance_matrix = correlation_matrix * (monthly_volatility ** 2 / n_obs)
+        # Sample of exponential distribution with same dimensions ad shock_mat
+        mean_vec = rng.standard_exponential((n_simulations, n_trails), dtype=np.float32)
 
-        # Result - n_simulations rows with n_trails inside
-        shock_mat = np.random.multivariate_normal(mean, covariance_matrix, n_simulations)
+        # Matrix of p-value distributions. Shocks and means are combined in units of shock_std, as the t-statistics
+        # are the simulated returns divided by it
+        tstat_matrix = _tstat_matrix_jit(shock_mat, common_shock, prob_vec, mean_vec, float(1 - rho) ** (1 / 2),
+                                         float(rho) ** (1 / 2), float(prob_zero_mean), float(lambd) / shock_std)
 
-        # Sample of uniform distribution with the same dimensions as shock_mat
-        prob_vec = np.random.uniform(0, 1, (n_simulations, n_trails))
+        return tstat_matrix
 
-        # Sample of exponential distribution with same dimensions ad shock_mat
-        mean_vec = np.random.exponential(lambd, (n_simulations, n_trails))
+    def _simulated_t_statistics(self, parameters, num_trails):
+        """
+        Provides the simulated t-statistics for the HLZ model parameters from _parameter_calculation method.
+
+        If the seed is set, the t-statistics are deterministic, so they are generated with _sample_random_multest
+        only once for every set of parameters and then reused.
 
-        # Taking the factors that have non-zero mean
-        nonzero_mean = prob_vec > prob_zero_mean
+        :param parameters: (np.array) Parameters of the HLZ model [rho, n_simulations, prob_zero_mean, lambd]
+        :param num_trails: (int) Total number of trials inside a simulation
+        :return: (np.ndarray) Array with distributions calculated
+        """
 
-        # Generating the null hypothesis - either zero mean or from an exponential distribution
-        mu_null = np.multiply(nonzero_mean, mean_vec)
+        if self.seed is None:  # Every call gives different t-statistics, nothing to reuse
+            return self._sample_random_multest(parameters[0], num_trails, parameters[2], parameters[3],
+                                               self.simulations)
 
-        # Matrix of p-value distributions
-        tstat_matrix = abs(mu_null + shock_mat) / (monthly_volatility / n_obs ** (1 / 2))
+        # Simulated t-statistics depend only on these values
+        cache_key = (parameters[0], num_trails, parameters[2], parameters[3], self.simulations, self.seed)
 
-        return tstat_matrix
+        if cache_key not in self._t_sample_cache:
+            self._t_sample_cache[cache_key] = self._sample_random_multest(parameters[0], num_trails, parameters[2],
+                                                                          parameters[3], self.simulations,
+                                                                          seed=self.seed)
+
+        return self._t_sample_cache[cache_key]
 
     @staticmethod
     def _parameter_calculation(rho):
@@ -113,21 +145,14 @@ class CampbellBacktesting:
                                      [0.6, 1773, 5.9902 * 0.1, 5.5512 * 0.001],
                                      [0.8, 3109, 8.3901 * 0.1, 5.5956 * 0.001]])
 
-        # Linear interpolation for parameter estimates
-        if (rho < 0):
+        if (rho < 0) or (rho >= 1):
             parameters = parameter_levels[1]  # Set at the preferred level if rho is misspecified
-        elif (rho < 0.2):
-            parameters = ((0.2 - rho) / 0.2) * parameter_levels[0] + ((rho - 0) / 0.2) * parameter_levels[1]
-        elif (rho < 0.4):
-            parameters = ((0.4 - rho) / 0.2) * parameter_levels[1] + ((rho - 0.2) / 0.2) * parameter_levels[2]
-        elif (rho < 0.6):
-            parameters = ((0.6 - rho) / 0.2) * parameter_levels[2] + ((rho - 0.4) / 0.2) * parameter_levels[3]
-        elif (rho < 0.8):
-            parameters = ((0.8 - rho) / 0.2) * parameter_levels[3] + ((rho - 0.6) / 0.2) * parameter_levels[4]
-        elif (rho < 1.0):  # Interpolation based on the previous level here
-            parameters = ((0.8 - rho) / 0.2) * parameter_levels[3] + ((rho - 0.6) / 0.2) * parameter_levels[4]
         else:
-            parameters = parameter_levels[1]  # Set at the preferred level if rho is misspecified
+            # Linear interpolation for parameter estimates between the closest levels below and above rho,
+            # for rho above the last level - extrapolation based on the previous level
+            lower_level = min(np.searchsorted(parameter_levels[:, 0], rho, side='right') - 1, 3)
+            weight = (rho - parameter_levels[lower_level, 0]) / 0.2
+            parameters = (1 - weight) * parameter_levels[lower_level] + weight * parameter_levels[lower_level + 1]
 
         return parameters
 
@@ -150,18 +175,7 @@ class CampbellBacktesting:
         """
 
         # If not annualized, calculating the appropriate multiplier for the Sharpe ratio
-        if sampling_frequency == 'D':
-            times_per_year = 360
-        elif sampling_frequency == 'W':
-            times_per_year = 52
-        elif sampling_frequency == 'M':
-            times_per_year = 12
-        elif sampling_frequency == 'Q':
-            times_per_year = 4
-        elif sampling_frequency == 'A':
-            times_per_year = 1
-        else:
-            times_per_year = 1  # Misspecified
+        times_per_year = TIMES_PER_YEAR.get(sampling_frequency, 1)  # Annual if misspecified
 
         if not annualized:
             annual_multiplier = times_per_year ** (1 / 2)
@@ -191,91 +205,75 @@ class CampbellBacktesting:
         :return: (np.float64) Number of monthly observations
         """
 
-        # N - Number of monthly observations
-        if sampling_frequency == 'D':
-            monthly_obs = np.floor(num_obs * 12 / 360)
-        elif sampling_frequency == 'W':
-            monthly_obs = np.floor(num_obs * 12 / 52)
-        elif sampling_frequency == 'M':
-            monthly_obs = np.floor(num_obs * 12 / 12)
-        elif sampling_frequency == 'Q':
-            monthly_obs = np.floor(num_obs * 12 / 4)
-        elif sampling_frequency == 'A':
-            monthly_obs = np.floor(num_obs * 12 / 1)
-        else:  # If the frequency is misspecified
-            monthly_obs = np.floor(num_obs)
+        # N - Number of monthly observations, observations are taken as monthly if the frequency is misspecified
+        monthly_obs = np.floor(num_obs * 12 / TIMES_PER_YEAR.get(sampling_frequency, 12))
 
         return monthly_obs
 
+    @staticmethod
+    def _bhy_constant(num_mult_test):
+        """
+        Calculates the constant used in BHY method - the sum of 1 / j for j from 1 to the number of multiple tests.
+
+        :param num_mult_test: (int) Number of multiple tests allowed
+        :return: (float) Constant used in BHY method
+        """
+
+        c_constant = np.sum(1 / np.arange(1, num_mult_test + 1))
+
+        return c_constant
+
     @staticmethod
     def _holm_method_sharpe(all_p_values, num_mult_test, p_val):
         """
-        Runs one cycle of the Holm method for the Haircut Shape ratio algorithm.
+        Runs the Holm method for the Haircut Shape ratio algorithm on all simulations at once.
 
-        :param all_p_values: (np.array) Sorted p-values to adjust
+        :param all_p_values: (np.array) Sorted p-values to adjust, one simulation per row
         :param num_mult_test: (int) Number of multiple tests allowed
         :param p_val: (float) Significance level p-value
-        :return: (np.float64) P-value adjusted at a significant level
+        :return: (np.array) P-values adjusted at a significant level for every simulation
         """
 
-        # Array for final p-values of the Holm method
-        p_holm_values = np.array([])
+        # Holm adjusted p-values (M-j+1)*p(j) in the paper
+        index_vector = np.arange(1, num_mult_test + 2)
+        p_adjusted_holm = (num_mult_test + 2 - index_vector) * all_p_values[:, :num_mult_test + 1]
 
-        # Iterating through multiple tests
-        for i in range(1, (num_mult_test + 2)):
-            # Creating array for Holm adjusted p-values (M-j+1)*p(j) in the paper
-            p_adjusted_holm = np.array([])
+        # Final p-values of the Holm method - running maximum of the adjusted p-values, capped at 1
+        p_holm_values = np.minimum(np.maximum.accumulate(p_adjusted_holm, axis=1), 1)
 
-            # Iterating through the available subsets of Holm adjusted p-values
-            for j in range(1, i + 1):
-                # Holm adjusted p-values
-                p_adjusted_holm = np.append(p_adjusted_holm, (num_mult_test + 1 - j + 1) * all_p_values[j - 1])
+        # Position of p_val in every row, same as np.searchsorted applied to each of the sorted rows
+        p_val_position = np.sum(all_p_values < p_val, axis=1, keepdims=True)
 
-            # Calculating the final p-values of the Holm method and adding to an array
-            p_holm_values = np.append(p_holm_values, min(max(p_adjusted_holm), 1))
-
-        # Getting the Holm adjusted p-value that is significant at our p_val level
-        p_holm_significant = p_holm_values[all_p_values == p_val]
-        p_holm_result = p_holm_significant[0]
+        # Getting the Holm adjusted p-values that are significant at our p_val level
+        p_holm_result = np.take_along_axis(p_holm_values, p_val_position, axis=1)[:, 0]
 
         return p_holm_result
 
     @staticmethod
-    def _bhy_method_sharpe(all_p_values, num_mult_test, p_val):
+    def _bhy_method_sharpe(all_p_values, num_mult_test, p_val, c_constant):
         """
-        Runs one cycle of the BHY method for the Haircut Shape ratio algorithm.
+        Runs the BHY method for the Haircut Shape ratio algorithm on all simulations at once.
 
-        :param all_p_values: (np.array) Sorted p-values to adjust
+        :param all_p_values: (np.array) Sorted p-values to adjust, one simulation per row
         :param num_mult_test: (int) Number of multiple tests allowed
         :param p_val: (float) Significance level p-value
         :param c_constant: (float) Constant used in BHY method
-        :return: (np.float64) P-value adjusted at a significant level
+        :return: (np.array) P-values adjusted at a significant level for every simulation
         """
 
-        # Array for final p-values of the BHY method
-        p_bhy_values = np.array([])
-
-        # BHY constant
+        # BHY adjusted p-values for all observations except the last one, which stays the same
         index_vector = np.arange(1, num_mult_test + 1)
-        c_constant = sum(1 / index_vector)
+        p_adjusted_bhy = ((num_mult_test + 1) * c_constant / index_vector) * all_p_values[:, :num_mult_test]
+        p_adjusted_bhy = np.append(p_adjusted_bhy, all_p_values[:, num_mult_test:num_mult_test + 1], axis=1)
 
-        # Iterating through multiple tests backwards
-        for i in range(num_mult_test + 1, 0, -1):
-            if i == (num_mult_test + 1):  # If it's the last observation
-                # The p-value stays the same
-                p_adjusted_holm = all_p_values[-1]
+        # Final p-values of the BHY method - running minimum of the adjusted p-values taken backwards
+        p_bhy_values = np.minimum.accumulate(p_adjusted_bhy[:, ::-1], axis=1)[:, ::-1]
 
-            else:  # If it's the previous observations
-                # The p-value is adjusted according to the BHY method
-                p_adjusted_holm = min(((num_mult_test + 1) * c_constant / i) * all_p_values[i - 1], p_previous)
+        # Position of p_val in every row, same as np.searchsorted applied to each of the sorted rows
+        p_val_position = np.sum(all_p_values < p_val, axis=1, keepdims=True)
 
-            # Adding the final BHY method p-values to an array
-            p_bhy_values = np.append(p_adjusted_holm, p_bhy_values)
-            p_previous = p_adjusted_holm
-
-        # Getting the BHY adjusted p-value that is significant at our p_val level
-        p_bhy_significant = p_bhy_values[all_p_values == p_val]
-        p_bhy_result = p_bhy_significant
+        # Getting the BHY adjusted p-values that are significant at our p_val level
+        p_bhy_result = np.take_along_axis(p_bhy_values, p_val_position, axis=1)[:, 0]
 
         return p_bhy_result
 
@@ -284,14 +282,14 @@ class CampbellBacktesting:
         """
         Calculates the adjusted Sharpe ratio and the haircut based on the final p-value of the method.
 
-        :param p_val: (float) Adjusted p-value of the method
+        :param p_val: (float/np.array) Adjusted p-value of the method, or an array of them for several methods
         :param monthly_obs: (int) Number of monthly observations
         :param sr_annual: (float) Annualized Sharpe ratio to compare to
         :return: (np.array) Elements (Adjusted annual Sharpe ratio, Haircut percentage)
         """
 
         # Inverting to get z-score of the method
-        z_score = ss.t.ppf(1 - p_val / 2, monthly_obs - 1)
+        z_score = stdtrit(monthly_obs - 1, 1 - p_val / 2)
 
         # Adjusted annualized Sharpe ratio of the method
         sr_adjusted = (z_score / monthly_obs ** (1 / 2)) * 12 ** (1 / 2)
@@ -312,24 +310,18 @@ class CampbellBacktesting:
         :return: (np.float64) P-value adjusted at a significant level
         """
 
-        # Array for adjusted significance levels
-        sign_levels = np.zeros(num_mult_test)
-
         # Creating adjusted levels of significance
-        for trail_number in range(1, num_mult_test + 1):
-            sign_levels[trail_number - 1] = alpha_sig / (num_mult_test + 1 - trail_number)
+        trail_numbers = np.arange(1, num_mult_test + 1)
+        sign_levels = alpha_sig / (num_mult_test + 1 - trail_numbers)
 
         # Where the simulations have higher p-values
         exceeding_pval = (p_values_simulation > sign_levels)
 
-        # Used to find the first exceeding p-value
-        exceeding_cumsum = np.cumsum(exceeding_pval)
-
-        if sum(exceeding_cumsum) == 0:  # If no exceeding p-values
+        if not exceeding_pval.any():  # If no exceeding p-values
             tstat_h = 1.96
         else:
-            # Getting the first exceeding p-value
-            p_val = p_values_simulation[exceeding_cumsum == 1]
+            # Getting the first exceeding p-value by its position
+            p_val = p_values_simulation[np.argmax(exceeding_pval)]
 
             # And the corresponding t-statistic
             tstat_h = ss.norm.ppf((1 - p_val / 2), 0, 1)
@@ -337,13 +329,14 @@ class CampbellBacktesting:
         return tstat_h
 
     @staticmethod
-    def _bhy_method_returns(p_values_simulation, num_mult_test, alpha_sig):
+    def _bhy_method_returns(p_values_simulation, num_mult_test, alpha_sig, c_constant=None):
         """
         Runs one cycle of the BHY method for the Profit Hurdle algorithm.
 
         :param p_values_simulation: (np.array) Sorted p-values to adjust
         :param num_mult_test: (int) Number of multiple tests allowed
         :param alpha_sig: (float) Significance level (e.g., 5%)
+        :param c_constant: (float) Constant used in BHY method, calculated if not provided
         :return: (np.float64) P-value adjusted at a significant level
         """
 
@@ -353,35 +346,32 @@ class CampbellBacktesting:
             # Sort in descending order
             p_desc = np.sort(p_values_simulation)[::-1]
 
-            # Calculating BHY constant
+            # Calculating BHY constant if it wasn't provided
             index_vector = np.arange(1, num_mult_test + 1)
-            c_constant = sum(1 / index_vector)
-
-            # Array for adjusted significance levels
-            sign_levels = np.zeros(num_mult_test)
+            if c_constant is None:
+                c_constant = CampbellBacktesting._bhy_constant(num_mult_test)
 
-            # Creating adjusted levels of significance
-            for trail_number in range(1, num_mult_test + 1):
-                sign_levels[trail_number - 1] = (alpha_sig * trail_number) / (num_mult_test * c_constant)
+            # Creating adjusted levels of significance, already in ascending order
+            sign_levels = (alpha_sig * index_vector) / (num_mult_test * c_constant)
 
             # Finding the first exceeding value
-            sign_levels_desc = np.sort(sign_levels)[::-1]
+            sign_levels_desc = sign_levels[::-1]
             exceeding_pval = (p_desc <= sign_levels_desc)
 
-            if sum(exceeding_pval) == 0:  # If no exceeding p-values
+            if not exceeding_pval.any():  # If no exceeding p-values
                 tstat_b = 1.96
             else:
-                # Getting the first exceeding p-value
-                p_val = p_desc[exceeding_pval == 1]
-                p_val_pos = np.argmin(abs(p_desc - p_val[0]))
+                # Getting the first exceeding p-value by its position
+                p_val_pos = np.argmax(exceeding_pval)
+                p_val = p_desc[p_val_pos]
 
                 if p_val_pos == 0:  # If exceeding value is first
-                    p_chosen = p_val[0]
+                    p_chosen = p_val
                 else:  # If not first
                     p_chosen = p_desc[p_val_pos - 1]
 
                 # And the corresponding t-statistic from p-value
-                tstat_b = ss.norm.ppf((1 - (p_val[0] + p_chosen) / 4), 0, 1)
+                tstat_b = ss.norm.ppf((1 - (p_val + p_chosen) / 4), 0, 1)
 
         return tstat_b
 
@@ -426,8 +416,7 @@ class CampbellBacktesting:
         num_trails = int((np.floor(num_mult_test / parameters[1]) + 1) * np.floor(parameters[1] + 1))
 
         # Generating a panel of t-ratios (of size self.simulations * num_simulations)
-        t_sample = self._sample_random_multest(parameters[0], num_trails, parameters[2], parameters[3],
-                                               self.simulations)
+        t_sample = self._simulated_t_statistics(parameters, num_trails)
 
         # Annual Sharpe ratio, adjusted to monthly
         sr_monthly = sr_annual / 12 ** (1 / 2)
@@ -436,33 +425,29 @@ class CampbellBacktesting:
         t_ratio = sr_monthly * monthly_obs ** (1 / 2)
 
         # Calculating adjusted p-value from the given t-ratio
-        p_val = 2 * (1 - ss.t.cdf(t_ratio, monthly_obs - 1))
-
-        # Creating arrays for p-values from simulations of Holm and BHY methods.
-        p_holm = np.ones(self.simulations)
-        p_bhy = np.ones(self.simulations)
+        p_val = 2 * (1 - stdtr(monthly_obs - 1, t_ratio))
 
-        # Iterating through the simulations
-        for simulation_number in range(1, self.simulations + 1):
+        # BHY constant, the same for every simulation
+        c_constant = self._bhy_constant(num_mult_test)
 
-            # Get one sample of previously generated simulation of t-values
-            t_values_simulation = t_sample[simulation_number - 1, 1:(num_mult_test + 1)]
+        # Previously generated simulations of t-values, one simulation per row
+        t_values_simulation = t_sample[:, 1:(num_mult_test + 1)]
 
-            # Calculating adjusted p-values from the simulated t-ratios
-            p_values_simulation = 2 * (1 - ss.norm.cdf(t_values_simulation, 0, 1))
+        # Calculating adjusted p-values from the simulated t-ratios, 2 * (1 - N(t)) = erfc(t / sqrt(2))
+        p_values_simulation = erfc(t_values_simulation / 2 ** (1 / 2))
 
-            # To the N (num_mult_test) other strategies tried (from the simulation),
-            # we add the adjusted p_value of the real strategy.
-            all_p_values = np.append(p_values_simulation, p_val)
+        # To the N (num_mult_test) other strategies tried (from every simulation),
+        # we add the adjusted p_value of the real strategy.
+        all_p_values = np.append(p_values_simulation, np.full((self.simulations, 1), p_val), axis=1)
 
-            # Ordering p-values
-            all_p_values = np.sort(all_p_values)
+        # Ordering p-values inside every simulation
+        all_p_values = np.sort(all_p_values, axis=1)
 
-            # Holm method
-            p_holm[simulation_number - 1] = self._holm_method_sharpe(all_p_values, num_mult_test, p_val)
+        # Holm method - p-values from all simulations
+        p_holm = self._holm_method_sharpe(all_p_values, num_mult_test, p_val)
 
-            # BHY method
-            p_bhy[simulation_number - 1] = self._bhy_method_sharpe(all_p_values, num_mult_test, p_val)
+        # BHY method - p-values from all simulations
+        p_bhy = self._bhy_method_sharpe(all_p_values, num_mult_test, p_val, c_constant)
 
         # Calculating the resulting p-values of methods from simulations
         # Array with adjusted p-values
@@ -470,15 +455,8 @@ class CampbellBacktesting:
         p_val_adj = np.array([np.minimum(num_mult_test * p_val, 1), np.median(p_holm), np.median(p_bhy)])
         p_val_adj = np.append(p_val_adj, (p_val_adj[0] + p_val_adj[1] + p_val_adj[2]) / 3)
 
-        # Arrays with adjusted Sharpe ratios and haircuts
-        sr_adj = np.zeros(4)
-        haircut = np.zeros(4)
-
-        # Adjusted Sharpe ratios and haircut percentages
-        sr_adj[0], haircut[0] = self._sharpe_ratio_haircut(p_val_adj[0], monthly_obs, sr_annual)
-        sr_adj[1], haircut[1] = self._sharpe_ratio_haircut(p_val_adj[1], monthly_obs, sr_annual)
-        sr_adj[2], haircut[2] = self._sharpe_ratio_haircut(p_val_adj[2], monthly_obs, sr_annual)
-        sr_adj[3], haircut[3] = self._sharpe_ratio_haircut(p_val_adj[3], monthly_obs, sr_annual)
+        # Arrays with adjusted Sharpe ratios and haircut percentages for all methods at once
+        sr_adj, haircut = self._sharpe_ratio_haircut(p_val_adj, monthly_obs, sr_annual)
 
         results = np.array([p_val_adj,
                             sr_adj,
@@ -521,44 +499,31 @@ class CampbellBacktesting:
         num_trails = int((np.floor(num_mult_test / parameters[1]) + 1) * np.floor(parameters[1] + 1))
 
         # Generating a panel of t-ratios (of size self.simulations * num_simulations)
-        t_sample = self._sample_random_multest(parameters[0], num_trails, parameters[2], parameters[3],
-                                               self.simulations)
+        t_sample = self._simulated_t_statistics(parameters, num_trails)
 
+        # Calculating p-values from the simulated t-ratios of all simulations at once, 2 * (1 - N(t)) = erfc(t / sqrt(2))
+        # and ordering them inside every simulation
+        p_values_sample = np.sort(erfc(t_sample[:, 1:(num_mult_test + 1)] / 2 ** (1 / 2)), axis=1)
+
+        # BHY constant, the same for every simulation
+        c_constant = self._bhy_constant(num_mult_test)
 
         # Arrays for final t-statistics for every simulation for Holm and BHY methods
-        tstats_holm = np.array([])
-        tstats_bhy = np.array([])
+        tstats_holm = np.empty(self.simulations)
+        tstats_bhy = np.empty(self.simulations)
 
         # Iterating through the simulations
         for simulation_number in range(1, self.simulations + 1):
-            # Holm method
-
-            # Get one sample of previously generated simulation of t-values
-            t_values_simulation = t_sample[simulation_number - 1, 1:(num_mult_test + 1)]
-
-            # Calculating p-values from the simulated t-ratios
-            p_values_simulation = 2 * (1 - ss.norm.cdf(t_values_simulation))
-            p_values_simulation = np.sort(p_values_simulation)
+            # Get one sample of previously calculated p-values
+            p_values_simulation = p_values_sample[simulation_number - 1]
 
-            # Holm method itself
-            tstat_h = self._holm_method_returns(p_values_simulation, num_mult_test, alpha_sig)
-
-            # Adding to array of t-statistics
-            tstats_holm = np.append(tstats_holm, tstat_h)
+            # Holm method
+            tstats_holm[simulation_number - 1] = self._holm_method_returns(p_values_simulation, num_mult_test,
+                                                                           alpha_sig)
 
             # BHY method
-
-            # Get one sample of previously generated simulation of t-values
-            t_values_simulation = t_sample[simulation_number - 1, 1:(num_mult_test + 1)]
-
-            # Calculating p-values from the simulated t-ratios
-            p_values_simulation = 2 * (1 - ss.norm.cdf(t_values_simulation))
-
-            # BHY method itself
-            tstat_b = self._bhy_method_returns(p_values_simulation, num_mult_test, alpha_sig)
-
-            # Adding to array of t-statistics
-            tstats_bhy = np.append(tstats_bhy, tstat_b)
+            tstats_bhy[simulation_number - 1] = self._bhy_method_returns(p_values_simulation, num_mult_test,
+                                                                         alpha_sig, c_constant)
 
         # Array of t-values for every method
         tcut_vec = np.array([tstat_independent, tstat_bonderroni, np.median(tstats_holm), np.median(tstats_bhy)])
@@ -570,3 +535,37 @@ class CampbellBacktesting:
         results = np.array([ret_hur[0], ret_hur[1], ret_hur[2], ret_hur[3], np.mean(ret_hur[1:-1])]) * 100
 
         return results
+
+
+@jit(parallel=True, nopython=True, cache=True)
+def _tstat_matrix_jit(shock_mat, common_shock, prob_vec, mean_vec, shock_weight, common_weight, prob_zero_mean,
+                      mean_scale):  # pragma: no cover
+    """
+    Part of CampbellBacktesting._sample_random_multest. Builds the matrix of simulated t-statistics from the samples
+    in one pass, processing simulations in parallel.
+
+    :param shock_mat: (np.array) Independent standard normal shocks for every trial of every simulation
+    :param common_shock: (np.array) Standard normal shocks common to all trials of a simulation
+    :param prob_vec: (np.array) Sample of uniform distribution used to pick factors with non-zero mean
+    :param mean_vec: (np.array) Sample of standard exponential distribution
+    :param shock_weight: (float) Weight of the independent shocks - sqrt(1 - rho)
+    :param common_weight: (float) Weight of the common shocks - sqrt(rho)
+    :param prob_zero_mean: (float) Probability for a random factor to have a zero mean
+    :param mean_scale: (float) Mean of the exponential distribution in units of the shocks standard deviation
+    :return: (np.array) Matrix of simulated t-statistics
+    """
+
+    tstat_matrix = np.empty_like(shock_mat)
+
+    for i in prange(shock_mat.shape[0]):  # pylint: disable=not-an-iterable
+        for j in range(shock_mat.shape[1]):
+            # Shock of the trial
+            tstat = shock_weight * shock_mat[i, j] + common_weight * common_shock[i, 0]
+
+            # Factors that have non-zero mean are taken from an exponential distribution
+            if prob_vec[i, j] > prob_zero_mean:
+                tstat += mean_scale * mean_vec[i, j]
+
+            tstat_matrix[i, j] = abs(tstat)
+
+    return tstat_matrix
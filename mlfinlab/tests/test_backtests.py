@@ -29,16 +29,14 @@ class TestCampbellBacktesting(unittest.TestCase):
                       autocorr_adjusted, rho_a, num_mult_test, rho)
 
         # Avoiding a random output
-        np.random.seed(0)
-
-        backtesting = CampbellBacktesting(400)
+        backtesting = CampbellBacktesting(400, seed=0)
         haircuts = backtesting.haircut_sharpe_ratios(*parameters)
 
         # Testing the adjusted p-values as other outputs are calculated from those
         self.assertAlmostEqual(haircuts[0][0], 0.465, delta=1e-2)
-        self.assertAlmostEqual(haircuts[0][1], 0.409, delta=1e-2)
-        self.assertAlmostEqual(haircuts[0][2], 0.174, delta=1e-2)
-        self.assertAlmostEqual(haircuts[0][3], 0.348, delta=1e-2)
+        self.assertAlmostEqual(haircuts[0][1], 0.405, delta=1e-2)
+        self.assertAlmostEqual(haircuts[0][2], 0.163, delta=1e-2)
+        self.assertAlmostEqual(haircuts[0][3], 0.344, delta=1e-2)
 
     def test_profit_hurdle(self):
         """
@@ -53,18 +51,44 @@ class TestCampbellBacktesting(unittest.TestCase):
         parameters = (num_mult_test, num_obs, alpha_sig, vol_anu, rho)
 
         # Avoiding a random output
-        np.random.seed(0)
-
-        backtesting = CampbellBacktesting(400)
+        backtesting = CampbellBacktesting(400, seed=0)
         p_values = backtesting.profit_hurdle(*parameters)
 
         # Testing the adjusted p-values as other outputs are calculated from them
         self.assertAlmostEqual(p_values[0], 0.365, delta=1e-2)
         self.assertAlmostEqual(p_values[1], 0.702, delta=1e-2)
-        self.assertAlmostEqual(p_values[2], 0.687, delta=1e-2)
-        self.assertAlmostEqual(p_values[3], 0.620, delta=1e-2)
+        self.assertAlmostEqual(p_values[2], 0.686, delta=1e-2)
+        self.assertAlmostEqual(p_values[3], 0.619, delta=1e-2)
         self.assertAlmostEqual(p_values[4], 0.694, delta=1e-2)
 
+    def test_simulated_t_statistics_seed(self):
+        """
+        Test that simulated t-statistics are reused when the seed is set and generated anew otherwise
+        """
+
+        backtesting = CampbellBacktesting(200)
+        parameters = backtesting._parameter_calculation(0.4)
+        num_trails = 1477
+
+        # Without a seed every call gives a new sample
+        t_sample = backtesting._simulated_t_statistics(parameters, num_trails)
+        self.assertFalse(np.array_equal(t_sample, backtesting._simulated_t_statistics(parameters, num_trails)))
+
+        # With a seed the sample is generated once and reused
+        backtesting_seed = CampbellBacktesting(200, seed=0)
+        t_sample_seed = backtesting_seed._simulated_t_statistics(parameters, num_trails)
+        self.assertIs(t_sample_seed, backtesting_seed._simulated_t_statistics(parameters, num_trails))
+        self.assertEqual(t_sample_seed.shape, (200, num_trails))
+
+        # And it is the same for other instances with the same seed
+        np.testing.assert_array_equal(t_sample_seed,
+                                      CampbellBacktesting(200, seed=0)._simulated_t_statistics(parameters, num_trails))
+
+        # Results of the algorithms are reproducible between calls
+        parameters_haircut = ('M', 120, 1, True, False, 0.1, 100, 0.4)
+        np.testing.assert_array_equal(backtesting_seed.haircut_sharpe_ratios(*parameters_haircut),
+                                      backtesting_seed.haircut_sharpe_ratios(*parameters_haircut))
+
     def test_holm_method_returns(self):
         """
         Test the special inputs to Holm method on required monthly returns.